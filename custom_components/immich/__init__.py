@@ -24,12 +24,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         verify_ssl=verify_ssl,
     )
 
-    if not await hub.authenticate():
-        raise InvalidAuth
-
-    hass.data[DOMAIN][entry.entry_id] = hub
+    try:
+        # Authenticating also opens the first pooled connection to the host
+        if not await hub.authenticate():
+            raise InvalidAuth
+
+        hass.data[DOMAIN][entry.entry_id] = hub
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await hub.close_session()
+        raise
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Tied to the entry, so it is cancelled when the entry is unloaded
+    entry.async_create_background_task(hass, hub.keepalive(), "immich keepalive")
 
     return True
 
@@ -2,219 +2,409 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date
 import logging
-from urllib.parse import urljoin
+import time
+from typing import Any
 
 import aiohttp
+import ijson
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as _json_loads
 
 from homeassistant.exceptions import HomeAssistantError
 
 _HEADER_API_KEY = "x-api-key"
+_THUMBNAIL_PATH = "/api/assets/{}/thumbnail?size=preview"
+# Seconds an idle pooled connection stays open before the connector closes it
+_KEEPALIVE_TIMEOUT = 75
+# Responses with a Content-Length of at least this many bytes are streamed
+_STREAM_MIN_BYTES = 65536
+# Buffered responses larger than this are parsed in an executor thread
+_EXECUTOR_MIN_BYTES = 32768
+# Maximum number of downloaded thumbnails kept for conditional requests
+_THUMBNAIL_CACHE_SIZE = 32
+# Size of the chunks yielded when streaming an asset
+_STREAM_CHUNK_SIZE = 65536
+# Number of attempts for requests that fail to connect or get a 429/5xx response
+_RETRIES = 3
+# How long parsed album and user info responses are reused, in seconds
+_CACHE_TTL = 60
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class AssetRef:
+    """Reference to an image asset, without its full metadata."""
+
+    id: str
+
+
+def _should_stream(response: aiohttp.ClientResponse) -> bool:
+    """Return whether the response body should be parsed incrementally."""
+    # Content-Length is the size on the wire, so with compression the JSON is at
+    # least this large. Unknown sizes (chunked transfer) are buffered and parsed
+    # by _parse_json, which moves large bodies off the event loop
+    content_length = response.content_length
+    return content_length is not None and content_length >= _STREAM_MIN_BYTES
+
+
+def _should_retry(status: int) -> bool:
+    """Return whether a response status is worth retrying."""
+    return status == 429 or status >= 500
+
+
+async def _raise_for_status(response: aiohttp.ClientResponse) -> None:
+    """Log the response body and raise if the API returned an error."""
+    if response.status != 200:
+        raw_result = await response.read()
+        _LOGGER.error(
+            "Error from API: status=%d body=%s", response.status, raw_result[:512]
+        )
+        raise ApiError()
+
+
+async def _parse_json(body: bytes) -> Any:
+    """Parse a JSON body, off the event loop if it is large."""
+    if len(body) > _EXECUTOR_MIN_BYTES:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _json_loads, body
+        )
+
+    return _json_loads(body)
+
+
+async def _stream_image_assets(
+    response: aiohttp.ClientResponse, prefix: str
+) -> list[AssetRef]:
+    """Incrementally parse the assets at prefix, keeping only images."""
+    return [
+        AssetRef(asset["id"])
+        async for asset in ijson.items_async(response.content, prefix, use_float=True)
+        if asset.get("type") == "IMAGE"
+    ]
+
+
 class ImmichHub:
     """Immich API hub."""
 
-    def __init__(self, host: str, api_key: str, verify_ssl: bool = True) -> None:
+    def __init__(
+        self,
+        host: str,
+        api_key: str,
+        verify_ssl: bool = True,
+        max_concurrency: int = 8,
+    ) -> None:
         """Initialize."""
         self.host = host
         self.api_key = api_key
-        connector = aiohttp.TCPConnector(ssl=verify_ssl)
+        # Keep pooled TLS connections to the single Immich server warm, and
+        # explicitly clean up closed transports so idle ones get re-pooled
+        connector = aiohttp.TCPConnector(
+            ssl=verify_ssl,
+            limit=20,
+            limit_per_host=10,
+            ttl_dns_cache=300,
+            keepalive_timeout=_KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True,
+        )
         self.session = aiohttp.ClientSession(connector=connector)  # Create one session
+        # Host and API key never change, so build the URL base and headers once
+        self._base = host.rstrip("/")
+        self._h_json = {"Accept": "application/json", _HEADER_API_KEY: api_key}
+        self._h_bin = {_HEADER_API_KEY: api_key}
+        # Limit the number of requests in flight to the Immich server at once. A
+        # counter guarded by a condition (rather than a semaphore) can be resized
+        self._active = 0
+        self._cmax = max_concurrency
+        self._cond = asyncio.Condition()
+        # Parsed responses keyed by request, along with their expiry time
+        self._cache: dict[str, tuple[float, Any]] = {}
+        # Asset info requests in flight, shared by concurrent callers
+        self._inflight: dict[str, asyncio.Task[dict]] = {}
+        # Least recently used thumbnails, keyed by asset id, with their ETag
+        self._thumb_cache: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+
+    async def keepalive(self) -> None:
+        """Ping the host before the idle pooled connection would be closed."""
+        while True:
+            await asyncio.sleep(_KEEPALIVE_TIMEOUT - 5)
+            try:
+                async with self._request("HEAD", "/api/server/ping", retries=1):
+                    pass
+            except (CannotConnect, TimeoutError):
+                _LOGGER.debug("Keepalive ping to the API failed")
 
     async def close_session(self) -> None:
         """Close session when done."""
         await self.session.close()
 
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Wait for a free request slot and hold it for the duration."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._cmax)
+            self._active += 1
+        try:
+            yield
+        finally:
+            # Free the slot before waiting on the lock, and shield the wakeup,
+            # so a caller cancelled during release can't leak its slot
+            self._active -= 1
+            await asyncio.shield(self._notify_waiter())
+
+    async def _notify_waiter(self) -> None:
+        """Wake one request waiting for a free slot."""
+        async with self._cond:
+            self._cond.notify(1)
+
+    async def set_concurrency(self, n: int) -> None:
+        """Change the maximum number of concurrent requests."""
+        if n < 1:
+            raise ValueError("Concurrency must be at least 1")
+
+        async with self._cond:
+            self._cmax = n
+            self._cond.notify_all()
+
+    async def _cached(
+        self, key: str, ttl: float, coro_factory: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached result for key, or fetch and cache it on a miss."""
+        now = time.monotonic()
+        if (entry := self._cache.get(key)) and entry[0] > now:
+            return entry[1]
+
+        result = await coro_factory()
+        self._cache[key] = (now + ttl, result)
+        return result
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop a cached response, or all cached responses if no key is given."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    @asynccontextmanager
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers: dict[str, str] | None = None,
+        retries: int = _RETRIES,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request, retrying with backoff on connection errors and 429/5xx."""
+        url = f"{self._base}{path}"
+
+        for attempt in range(retries):
+            last_attempt = attempt == retries - 1
+
+            async with self._slot():
+                try:
+                    response = await self.session.request(
+                        method, url, headers=headers or self._h_json, **kwargs
+                    )
+                except aiohttp.ClientError as exception:
+                    if last_attempt:
+                        _LOGGER.error("Error connecting to the API: %s", exception)
+                        raise CannotConnect from exception
+                    _LOGGER.debug("Error connecting to the API: %s", exception)
+                else:
+                    async with response:
+                        if last_attempt or not _should_retry(response.status):
+                            try:
+                                yield response
+                            except aiohttp.ClientError as exception:
+                                _LOGGER.error(
+                                    "Error connecting to the API: %s", exception
+                                )
+                                raise CannotConnect from exception
+                            return
+                    _LOGGER.debug("Error from API: status=%d", response.status)
+
+            await asyncio.sleep(2**attempt)
+
+    async def _request_json(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request and return the parsed JSON response."""
+        async with self._request(method, path, **kwargs) as response:
+            await _raise_for_status(response)
+            return await _parse_json(await response.read())
+
     async def authenticate(self) -> bool:
         """Test if we can authenticate with the host."""
         try:
-            url = urljoin(self.host, "/api/auth/validateToken")
-            headers = {"Accept": "application/json", _HEADER_API_KEY: self.api_key}
-
-            async with self.session.post(url=url, headers=headers) as response:
-                if response.status != 200:
-                    raw_result = await response.text()
-                    _LOGGER.error("Error from API: body=%s", raw_result)
-                    return False
+            auth_result = await self._request_json("POST", "/api/auth/validateToken")
+        except ApiError:
+            return False
 
-                auth_result = await response.json()
+        if not auth_result.get("authStatus"):
+            _LOGGER.error("Error from API: body=%s", auth_result)
+            return False
 
-                if not auth_result.get("authStatus"):
-                    raw_result = await response.text()
-                    _LOGGER.error("Error from API: body=%s", raw_result)
-                    return False
-
-                return True
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+        return True
 
     async def get_my_user_info(self) -> dict:
         """Get user info."""
-        try:
-            url = urljoin(self.host, "/api/users/me")
-            headers = {"Accept": "application/json", _HEADER_API_KEY: self.api_key}
-
-            async with self.session.get(url=url, headers=headers) as response:
-                if response.status != 200:
-                    raw_result = await response.text()
-                    _LOGGER.error("Error from API: body=%s", raw_result)
-                    raise ApiError()
+        return await self._cached("user_info", _CACHE_TTL, self._get_my_user_info)
 
-                user_info: dict = await response.json()
+    async def _get_my_user_info(self) -> dict:
+        """Fetch user info from the API."""
+        user_info: dict = await self._request_json("GET", "/api/users/me")
 
-                return user_info
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+        return user_info
 
     async def get_asset_info(self, asset_id: str) -> dict | None:
-        """Get asset info."""
-        try:
-            url = urljoin(self.host, f"/api/assets/{asset_id}")
-            headers = {"Accept": "application/json", _HEADER_API_KEY: self.api_key}
+        """Get asset info, sharing one request between concurrent callers."""
+        if (task := self._inflight.get(asset_id)) is None:
+            task = asyncio.create_task(
+                self._request_json("GET", f"/api/assets/{asset_id}")
+            )
+            self._inflight[asset_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(asset_id, None))
 
-            async with self.session.get(url=url, headers=headers) as response:
-                if response.status != 200:
-                    raw_result = await response.text()
-                    _LOGGER.error("Error from API: body=%s", raw_result)
-                    raise ApiError()
+        # Shield so a cancelled caller doesn't cancel the request for the others
+        asset_info: dict = await asyncio.shield(task)
 
-                asset_info: dict = await response.json()
+        return asset_info
 
-                return asset_info
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+    async def get_assets_info(self, asset_ids: Iterable[str]) -> list[dict | None]:
+        """Get info for several assets concurrently."""
+        return await asyncio.gather(
+            *(self.get_asset_info(asset_id) for asset_id in asset_ids)
+        )
 
     async def download_asset(self, asset_id: str) -> bytes | None:
         """Download the asset."""
-        try:
-            url = urljoin(self.host, f"/api/assets/{asset_id}/thumbnail?size=preview")
-            headers = {_HEADER_API_KEY: self.api_key}
+        path = _THUMBNAIL_PATH.format(asset_id)
+        headers = self._h_bin
 
-            async with self.session.get(url=url, headers=headers) as response:
-                if response.status != 200:
-                    _LOGGER.error("Error from API: status=%d", response.status)
-                    return None
+        # Only ask for the thumbnail if it changed since we last downloaded it
+        if cached := self._thumb_cache.get(asset_id):
+            headers = {**self._h_bin, "If-None-Match": cached[0]}
 
-                return await response.read()
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+        async with self._request("GET", path, headers=headers) as response:
+            if response.status == 304 and cached:
+                # Re-add it, as it may have been evicted while this request ran
+                self._cache_thumbnail(asset_id, cached)
+                return cached[1]
 
-    async def list_favorite_images(self) -> list[dict]:
+            if response.status != 200:
+                _LOGGER.error("Error from API: status=%d", response.status)
+                return None
+
+            asset_bytes = await response.read()
+
+            if etag := response.headers.get("ETag"):
+                self._cache_thumbnail(asset_id, (etag, asset_bytes))
+
+            return asset_bytes
+
+    def _cache_thumbnail(self, asset_id: str, entry: tuple[str, bytes]) -> None:
+        """Store a thumbnail as most recently used, evicting the oldest if full."""
+        self._thumb_cache[asset_id] = entry
+        self._thumb_cache.move_to_end(asset_id)
+        if len(self._thumb_cache) > _THUMBNAIL_CACHE_SIZE:
+            self._thumb_cache.popitem(last=False)
+
+    async def stream_asset(self, asset_id: str) -> AsyncIterator[bytes]:
+        """Stream the asset in chunks, without buffering it in memory.
+
+        The stream holds a request slot until it is exhausted or closed, so
+        callers that may stop early must wrap it in contextlib.aclosing().
+        """
+        path = _THUMBNAIL_PATH.format(asset_id)
+
+        async with self._request("GET", path, headers=self._h_bin) as response:
+            await _raise_for_status(response)
+
+            async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+                yield chunk
+
+    async def list_favorite_images(self) -> list[AssetRef]:
         """List all favorite images."""
-        try:
-            url = urljoin(self.host, "/api/search/metadata")
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                _HEADER_API_KEY: self.api_key,
-            }
-            json_data = {"isFavorite": True}
-
-            async with self.session.post(
-                url=url, headers=headers, json=json_data
-            ) as response:
-                if response.status != 200:
-                    raw_result = await response.text()
-                    _LOGGER.error("Error from API: body=%s", raw_result)
-                    raise ApiError()
-
-                favorites = await response.json()
-                assets: list[dict] = favorites["assets"]["items"]
-
-                filtered_assets: list[dict] = [
-                    asset for asset in assets if asset["type"] == "IMAGE"
-                ]
-
-                return filtered_assets
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+        # Let the server filter out videos instead of doing it here
+        json_data = {"isFavorite": True, "type": "IMAGE"}
+
+        favorites = await self._request_json(
+            "POST", "/api/search/metadata", json=json_data
+        )
+        assets: list[AssetRef] = [
+            AssetRef(asset["id"]) for asset in favorites["assets"]["items"]
+        ]
+
+        return assets
 
     async def list_all_albums(self) -> list[dict]:
         """List all albums."""
-        try:
-            url = urljoin(self.host, "/api/albums")
-            headers = {"Accept": "application/json", _HEADER_API_KEY: self.api_key}
-
-            async with self.session.get(url=url, headers=headers) as response:
-                if response.status != 200:
-                    raw_result = await response.text()
-                    _LOGGER.error("Error from API: body=%s", raw_result)
-                    raise ApiError()
+        return await self._cached("albums", _CACHE_TTL, self._list_all_albums)
 
-                album_list: list[dict] = await response.json()
+    async def _list_all_albums(self) -> list[dict]:
+        """Fetch all albums from the API."""
+        album_list: list[dict] = await self._request_json("GET", "/api/albums")
 
-                return album_list
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+        return album_list
 
-    async def list_album_images(self, album_id: str) -> list[dict]:
+    async def list_album_images(self, album_id: str) -> list[AssetRef]:
         """List all images in an album."""
-        try:
-            url = urljoin(self.host, f"/api/albums/{album_id}")
-            headers = {"Accept": "application/json", _HEADER_API_KEY: self.api_key}
+        return await self._cached(
+            f"album:{album_id}",
+            _CACHE_TTL,
+            lambda: self._list_album_images(album_id),
+        )
+
+    async def _list_album_images(self, album_id: str) -> list[AssetRef]:
+        """Fetch all images in an album from the API."""
+        async with self._request("GET", f"/api/albums/{album_id}") as response:
+            await _raise_for_status(response)
 
-            async with self.session.get(url=url, headers=headers) as response:
-                if response.status != 200:
-                    raw_result = await response.text()
-                    _LOGGER.error("Error from API: body=%s", raw_result)
-                    raise ApiError()
+            if _should_stream(response):
+                return await _stream_image_assets(response, "assets.item")
 
-                album_info: dict = await response.json()
-                assets: list[dict] = album_info["assets"]
+            album_info: dict = await _parse_json(await response.read())
+            assets: list[dict] = album_info["assets"]
 
-                filtered_assets: list[dict] = [
-                    asset for asset in assets if asset["type"] == "IMAGE"
-                ]
+            filtered_assets: list[AssetRef] = [
+                AssetRef(asset["id"]) for asset in assets if asset["type"] == "IMAGE"
+            ]
 
-                return filtered_assets
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+            return filtered_assets
 
-    async def list_memory_lane_images(self) -> list[dict]:
+    async def list_memory_lane_images(self) -> list[AssetRef]:
         """Fetch today's memory lane images.
         
         Uses the /api/memories endpoint to retrieve "On This Day" memories.
         """
-        from datetime import datetime
-
-        date = datetime.now()
         # Format date as ISO 8601 for the API
-        date_str = date.strftime("%Y-%m-%d")
+        date_str = date.today().isoformat()
 
-        try:
-            url = urljoin(self.host, f"/api/memories?for={date_str}")
-            headers = {"Accept": "application/json", _HEADER_API_KEY: self.api_key}
-
-            async with self.session.get(url=url, headers=headers) as response:
-                if response.status != 200:
-                    raw_result = await response.text()
-                    _LOGGER.error("Error from API: body=%s", raw_result)
-                    raise ApiError()
-
-                memories: list[dict] = await response.json()
-                assets = []
-                
-                # Extract image assets from all memories
-                for memory in memories:
-                    if "assets" in memory:
-                        for asset in memory["assets"]:
-                            # Filter to only include images (not videos)
-                            if asset.get("type") == "IMAGE":
-                                assets.append(asset)
-                
-                return assets
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error connecting to the API: %s", exception)
-            raise CannotConnect from exception
+        async with self._request("GET", f"/api/memories?for={date_str}") as response:
+            await _raise_for_status(response)
+
+            if _should_stream(response):
+                return await _stream_image_assets(response, "item.assets.item")
+
+            memories: list[dict] = await _parse_json(await response.read())
+
+            # Extract image assets (not videos) from all memories
+            assets: list[AssetRef] = [
+                AssetRef(asset["id"])
+                for memory in memories
+                for asset in memory.get("assets", ())
+                if asset.get("type") == "IMAGE"
+            ]
+
+            return assets
 
 
 class CannotConnect(HomeAssistantError):
@@ -158,7 +158,7 @@ class ImmichImageFavorite(BaseImmichImage):
 
     async def _refresh_available_asset_ids(self) -> list[str] | None:
         """Refresh the list of available asset IDs."""
-        return [image["id"] for image in await self.hub.list_favorite_images()]
+        return [image.id for image in await self.hub.list_favorite_images()]
 
 
 class ImmichImageAlbum(BaseImmichImage):
@@ -175,9 +175,7 @@ class ImmichImageAlbum(BaseImmichImage):
 
     async def _refresh_available_asset_ids(self) -> list[str] | None:
         """Refresh the list of available asset IDs."""
-        return [
-            image["id"] for image in await self.hub.list_album_images(self._album_id)
-        ]
+        return [image.id for image in await self.hub.list_album_images(self._album_id)]
 
 
 class ImmichImageMemoryLane(BaseImmichImage):
@@ -187,4 +185,4 @@ class ImmichImageMemoryLane(BaseImmichImage):
     _attr_name = "Immich: Memory Lane"
 
     async def _refresh_available_asset_ids(self) -> list[str] | None:
-        return [asset["id"] for asset in await self.hub.list_memory_lane_images()]
+        return [asset.id for asset in await self.hub.list_memory_lane_images()]